@@ -1,15 +1,28 @@
 import json
 import io
-import math
-import matplotlib.pyplot as plt
+import logging
+import os
+import hashlib
+import functools
+import re
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 from pptx import Presentation
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_VERTICAL_ANCHOR, MSO_AUTO_SIZE
-import numpy as np
-from datetime import datetime
+from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION, XL_MARKER_STYLE
+from pptx.chart.data import CategoryChartData
+
+logger = logging.getLogger(__name__)
 
 # --- Helper Functions ---
+@functools.lru_cache(maxsize=64)
 def hex_to_rgb(hex_color):
     """Convert hex color string to RGBColor object."""
     hex_color = hex_color.lstrip('#')
@@ -28,6 +41,39 @@ TITLE_HEIGHT = Inches(0.8)
 CONTENT_TOP = Inches(1.2)
 CONTENT_MAX_WIDTH = SLIDE_WIDTH - (2 * SLIDE_MARGIN)
 CONTENT_MAX_HEIGHT = SLIDE_HEIGHT - CONTENT_TOP - SLIDE_MARGIN
+TITLE_MARGIN_X = Inches(0.2)
+TITLE_MARGIN_TOP = Inches(0.1)
+TITLE_LINE_WIDTH = Pt(1)
+CHART_WIDTH = Inches(4)
+CHART_HEIGHT = Inches(3)
+# Resolution of the 8x6 in. chart figure; 60 DPI gives 120 DPI on the 4x3 in. picture
+DEFAULT_CHART_DPI = 60
+
+def _chart_dpi_from_env():
+    """Read SLIDER_CHART_DPI, falling back to the default for unusable values"""
+    value = os.getenv("SLIDER_CHART_DPI")
+    if value is None:
+        return DEFAULT_CHART_DPI
+    try:
+        dpi = int(value)
+    except ValueError:
+        dpi = 0
+    if not 10 <= dpi <= 600:
+        logger.warning("Invalid SLIDER_CHART_DPI %r, using %s", value, DEFAULT_CHART_DPI)
+        return DEFAULT_CHART_DPI
+    return dpi
+
+CHART_DPI = _chart_dpi_from_env()
+TEXT_BOX_HEIGHT = Inches(3)
+TABLE_ROW_HEIGHT = Inches(0.4)
+TABLE_TOP_OFFSET = Inches(0.5)
+
+# --- Font Size Constants ---
+TITLE_SLIDE_FONT_SIZE = Pt(36)
+SUBTITLE_FONT_SIZE = Pt(24)
+TITLE_FONT_SIZE = Pt(28)
+HEADLINE_FONT_SIZE = Pt(20)
+SUBHEADING_FONT_SIZE = Pt(18)
 
 # --- Slide Dimension Constants ---
 SLIDE_BACKGROUND_COLOR = RGBColor(15, 22, 50)
@@ -38,20 +84,170 @@ ROW_COLOR_DARK = RGBColor(0x2A, 0x39, 0x50)
 BRAND_COLORS = ['#007ACC', '#09534F', '#4CAF50', '#FF9800', '#F44336', '#9C27B0']
 HYPERLINK_COLOR = RGBColor(0xFF, 0xFF, 0xFF)
 
+# Chart types PowerPoint can draw natively (no matplotlib rasterization)
+NATIVE_CHART_TYPES = {
+    "bar": XL_CHART_TYPE.COLUMN_CLUSTERED,
+    "pie": XL_CHART_TYPE.PIE,
+    "line": XL_CHART_TYPE.LINE_MARKERS,
+}
+
+# --- Chart Render Cache ---
+CHART_CACHE_SIZE = 128
+_CHART_CACHE = OrderedDict()
+_CHART_CACHE_LOCK = threading.Lock()
+
+def _chart_cache_key(chart_type, labels, values, dpi):
+    """Build a content key for a chart so identical charts are rendered once."""
+    payload = json.dumps({"t": chart_type, "l": labels, "v": values, "d": dpi}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def _get_cached_chart(key):
+    """Return cached PNG bytes for a chart key, or None on a miss."""
+    with _CHART_CACHE_LOCK:
+        png = _CHART_CACHE.get(key)
+        if png is not None:
+            _CHART_CACHE.move_to_end(key)
+        return png
+
+def _store_cached_chart(key, png):
+    """Store rendered PNG bytes, evicting the least recently used chart."""
+    with _CHART_CACHE_LOCK:
+        _CHART_CACHE[key] = png
+        _CHART_CACHE.move_to_end(key)
+        while len(_CHART_CACHE) > CHART_CACHE_SIZE:
+            _CHART_CACHE.popitem(last=False)
+
+# --- Lazy Chart Backend ---
+# matplotlib, numpy and Pillow are imported on the first chart render, so chart-less
+# decks never pay for them. The shared figure is reused across renders to skip
+# per-chart Figure/canvas setup. It keeps the 8x6 in. layout the font sizes were
+# chosen for; the picture is placed at half that size (see calculate_chart_size),
+# so output resolution is set by SLIDER_CHART_DPI alone.
+np = None
+setp = None
+Image = None
+_FIG = None
+_BRAND_RGB = None
+_FIG_LOCK = threading.Lock()
+_CHART_BUFFER = io.BytesIO()  # PNG scratch buffer, reused under _FIG_LOCK
+
+def _load_chart_backend():
+    """Import matplotlib/numpy/Pillow and build the shared chart figure on first use."""
+    global np, setp, Image, _FIG, _BRAND_RGB
+    if _FIG is not None:
+        return
+    with _FIG_LOCK:
+        if _FIG is not None:
+            return
+        import matplotlib
+        matplotlib.use('Agg')
+        import numpy
+        from matplotlib.artist import setp as mpl_setp
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from PIL import Image as PILImage
+        
+        # Brand colors as RGB floats so matplotlib skips hex parsing on every draw
+        _BRAND_RGB = numpy.array([[int(c[1:3], 16) / 255, int(c[3:5], 16) / 255, int(c[5:7], 16) / 255]
+                                  for c in BRAND_COLORS])
+        np, setp, Image = numpy, mpl_setp, PILImage
+        fig = Figure(figsize=(8, 6), layout='constrained')
+        FigureCanvasAgg(fig)
+        _FIG = fig
+
+# --- Presentation Template ---
+def set_background_color(prs, color):
+    """Paint the slide master background; layouts and slides inherit it"""
+    fill = prs.slide_master.background.fill
+    fill.solid()
+    fill.fore_color.rgb = color
+
+def _build_template_bytes():
+    """Build the blank 16:9 deck with the default background, serialized once."""
+    prs = Presentation()
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    set_background_color(prs, SLIDE_BACKGROUND_COLOR)
+    template = io.BytesIO()
+    prs.save(template)
+    return template.getvalue()
+
+_TEMPLATE_BYTES = _build_template_bytes()
+
+# --- Presentation Pool ---
+# Saved decks are stripped back to the blank template and reused, so steady
+# load skips re-parsing the template package for every request
+PRESENTATION_POOL_SIZE = 8
+_PRESENTATION_POOL = queue.Queue(maxsize=PRESENTATION_POOL_SIZE)
+
+def _acquire_presentation():
+    """Take a blank deck from the pool, or load a fresh one from the template"""
+    try:
+        return _PRESENTATION_POOL.get_nowait()
+    except queue.Empty:
+        return Presentation(io.BytesIO(_TEMPLATE_BYTES))
+
+def release_presentation(prs):
+    """Remove all slides from a saved deck and return it to the pool"""
+    slide_ids = prs.slides._sldIdLst
+    for slide_id in list(slide_ids):
+        slide_ids.remove(slide_id)
+        prs.part.drop_rel(slide_id.rId)
+    set_background_color(prs, SLIDE_BACKGROUND_COLOR)
+    try:
+        _PRESENTATION_POOL.put_nowait(prs)
+    except queue.Full:
+        pass
+
+# --- Table Cell XML ---
+_EMPTY_CELL_XML = '<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p/></a:txBody><a:tcPr/></a:tc>'
+_XML_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+def _cell_xml_template(font_color, fill_color=None, bold=False):
+    """Pre-build a styled <a:tc> with a {text} slot, matching the python-pptx cell styling"""
+    bold_attr = ' b="1"' if bold else ''
+    fill = f'<a:solidFill><a:srgbClr val="{fill_color}"/></a:solidFill>' if fill_color else ''
+    return (
+        '<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:pPr algn="l">'
+        f'<a:defRPr sz="1200"{bold_attr}><a:solidFill><a:srgbClr val="{font_color}"/></a:solidFill>'
+        f'<a:latin typeface="{text_font}"/></a:defRPr></a:pPr>{{text}}</a:p></a:txBody>'
+        f'<a:tcPr>{fill}</a:tcPr></a:tc>'
+    )
+
+def _cell_text_xml(text):
+    """Escape cell text into runs, one paragraph per line like python-pptx does"""
+    lines = escape(_XML_ILLEGAL_CHARS.sub('', text)).split('\n')
+    return '</a:p><a:p>'.join(f'<a:r><a:t>{line}</a:t></a:r>' if line else '' for line in lines)
+
+# --- Paragraph Styling ---
+@functools.lru_cache(maxsize=32)
+def _def_rpr_xml(font_name, centipoints, color, bold):
+    """Stock <a:defRPr> markup for one font/size/color/bold combination"""
+    bold_attr = ' b="1"' if bold else ''
+    return (
+        f'<a:defRPr {nsdecls("a")} sz="{centipoints}"{bold_attr}>'
+        f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+        f'<a:latin typeface="{font_name}"/></a:defRPr>'
+    )
+
+def set_paragraph_font(paragraph, font_name, size, color, bold=False):
+    """Set a paragraph's font name, size, color and bold with a single XML edit"""
+    pPr = paragraph._p.get_or_add_pPr()
+    pPr._remove_defRPr()
+    pPr._insert_defRPr(parse_xml(_def_rpr_xml(font_name, size.centipoints, str(color), bold)))
+
 # --- Helper Functions ---
 def set_title_style(title_shape, presentation_width, customization):
-    title_shape.left = Inches(0)
+    title_shape.left = 0
     title_shape.width = SLIDE_WIDTH
     title_shape.height = TITLE_HEIGHT
     title_shape.fill.solid()
     title_shape.fill.fore_color.rgb = hex_to_rgb(customization.get('title_bg_color', '#44546A'))
     line = title_shape.line
     line.color.rgb = hex_to_rgb(customization.get('title_bg_color', '#44546A'))
-    line.width = Pt(1)
-    font = title_shape.text_frame.paragraphs[0].font
-    font.name = heading_font
-    font.size = Pt(28)
-    font.color.rgb = hex_to_rgb(customization.get('title_font_color', '#FFFFFF'))
+    line.width = TITLE_LINE_WIDTH
+    set_paragraph_font(title_shape.text_frame.paragraphs[0], heading_font, TITLE_FONT_SIZE,
+                       hex_to_rgb(customization.get('title_font_color', '#FFFFFF')))
     
     position = customization.get('title_position', 'left')
     if position == 'center':
@@ -60,9 +256,9 @@ def set_title_style(title_shape, presentation_width, customization):
         title_shape.text_frame.paragraphs[0].alignment = PP_ALIGN.LEFT
 
     tf = title_shape.text_frame
-    tf.margin_left = Inches(0.2)
-    tf.margin_right = Inches(0.2)
-    tf.margin_top = Inches(0.1)
+    tf.margin_left = TITLE_MARGIN_X
+    tf.margin_right = TITLE_MARGIN_X
+    tf.margin_top = TITLE_MARGIN_TOP
 
 def ensure_content_fits(left, top, width, height):
     """Ensure content stays within slide boundaries"""
@@ -76,7 +272,7 @@ def ensure_content_fits(left, top, width, height):
 
 def calculate_chart_size():
     """Calculate optimal chart size"""
-    return Inches(4), Inches(3)
+    return CHART_WIDTH, CHART_HEIGHT
 
 def truncate_text_if_needed(text, max_length):
     """Truncate text to prevent overflow"""
@@ -85,66 +281,39 @@ def truncate_text_if_needed(text, max_length):
     return text[:max_length-3] + "..."
 
 class GeneralPresentation:
-    def __init__(self, data, search_phrase="Business Analysis", customization=None):
+    def __init__(self, data, search_phrase="Business Analysis", customization=None, native_charts=False):
         if not data:
             raise ValueError("Input data is empty.")
             
-        print(f"DEBUG: GeneralPresentation init - data type: {type(data)}")
-        print(f"DEBUG: GeneralPresentation init - data content: {data}")
+        logger.debug("GeneralPresentation init - data type: %s", type(data))
+        logger.debug("GeneralPresentation init - data content: %s", data)
         
         # Ensure data is parsed if it's a JSON string
         if isinstance(data, str):
             try:
                 data = json.loads(data)
-                print(f"DEBUG: GeneralPresentation init - parsed JSON: {data}")
+                logger.debug("GeneralPresentation init - parsed JSON: %s", data)
             except json.JSONDecodeError as e:
-                print(f"DEBUG: GeneralPresentation init - JSON parsing error: {str(e)}")
+                logger.debug("GeneralPresentation init - JSON parsing error: %s", e)
                 raise ValueError("Input data is not valid JSON.")
         
         self.data = data
         self.search_phrase = search_phrase
         self.customization = customization or {}
-        self.prs = Presentation()
-        self.prs.slide_width = Inches(16)
-        self.prs.slide_height = Inches(9)
+        self.native_charts = native_charts
+        self.prs = _acquire_presentation()
         self.MAX_ROWS_PER_TABLE = 10
         
         # Apply customizations or use defaults
         self.slide_bg_color = hex_to_rgb(self.customization.get('slide_bg_color', '#0F1632'))
         self.body_text_color = hex_to_rgb(self.customization.get('body_text_color', '#FFFFFF'))
         self.font_size = Pt(self.customization.get('font_size', 16))
+        self.title_bg_color = hex_to_rgb(self.customization.get('title_bg_color', '#44546A'))
         
-        # Set background for all layouts
-        for layout in self.prs.slide_layouts:
-            layout.background.fill.solid()
-            layout.background.fill.fore_color.rgb = self.slide_bg_color
+        # The template (and every pooled deck) already carries the default background
+        if self.slide_bg_color != SLIDE_BACKGROUND_COLOR:
+            set_background_color(self.prs, self.slide_bg_color)
     
-    def _set_cell_style(self, cell, text, is_header=False, is_dark_row=False):
-        """Style table cells with professional formatting"""
-        cell.text = text
-        p = cell.text_frame.paragraphs[0]
-        p.alignment = PP_ALIGN.LEFT
-        p.vertical_anchor = MSO_VERTICAL_ANCHOR.MIDDLE
-        font = p.font
-        font.name = text_font
-        font.size = Pt(12)
-        
-        if is_header:
-            font.bold = True
-            font.color.rgb = TABLE_HEADER_FONT_COLOR
-            cell.fill.solid()
-            cell.fill.fore_color.rgb = hex_to_rgb(self.customization.get('title_bg_color', '#44546A'))
-        else:
-            font.color.rgb = self.body_text_color
-            if is_dark_row:
-                cell.fill.solid()
-                cell.fill.fore_color.rgb = ROW_COLOR_DARK
-        
-        cell.text_frame.margin_left = Inches(0.1)
-        cell.text_frame.margin_right = Inches(0.1)
-        cell.text_frame.margin_top = Inches(0.05)
-        cell.text_frame.margin_bottom = Inches(0.05)
-
     def _create_data_chart(self, chart_data, chart_type="bar"):
         """Create various types of charts from data"""
         if not chart_data or 'labels' not in chart_data or 'values' not in chart_data:
@@ -156,70 +325,151 @@ class GeneralPresentation:
         # Validate data to prevent division by zero
         if not labels or not values or len(labels) == 0 or len(values) == 0:
             return None
+
+        # Identical charts across slides (or decks) are rendered only once
+        cache_key = _chart_cache_key(chart_type, labels, values, CHART_DPI)
+        cached_png = _get_cached_chart(cache_key)
+        if cached_png is not None:
+            return io.BytesIO(cached_png)
             
+        _load_chart_backend()
+        
         # Convert values to float and handle zero/negative values for pie charts
         try:
-            values = [float(v) if v is not None else 0 for v in values]
+            values = np.asarray([v if v is not None else 0 for v in values], dtype=float)
         except (ValueError, TypeError):
             return None
             
         # For pie charts, ensure we have positive values
         if chart_type == "pie":
-            values = [abs(v) if v != 0 else 0.1 for v in values]  # Replace zeros with small positive values
-            if sum(values) == 0:
+            values = np.where(values != 0, np.abs(values), 0.1)  # Replace zeros with small positive values
+            if values.sum() == 0:
                 return None
         
-        fig, ax = plt.subplots(figsize=(8, 6))
-        fig.patch.set_facecolor('none')
-        ax.set_facecolor('none')
-        
-        try:
-            if chart_type == "pie":
-                wedges, texts, autotexts = ax.pie(
-                    values, labels=labels, autopct='%.1f%%', startangle=90,
-                    colors=BRAND_COLORS[:len(values)], textprops={'color': 'white'}
-                )
-                plt.setp(autotexts, size=10, weight="bold", fontname=key_font)
-                plt.setp(texts, size=12, fontname=text_font)
+        # Slice labels and colors to the value count once for every chart type
+        labels = labels[:len(values)]
+        colors = _BRAND_RGB[:len(values)]
+        
+        # The shared figure is not thread-safe; hold the lock for the whole render
+        with _FIG_LOCK:
+            fig = _FIG
+            fig.clear()
+            fig.set_dpi(CHART_DPI)
+            ax = fig.add_subplot(111)
+            fig.patch.set_facecolor('none')
+            ax.set_facecolor('none')
             
-            elif chart_type == "bar":
-                bars = ax.bar(labels, values, color=BRAND_COLORS[:len(values)])
-                ax.set_ylabel('Values', color='white')
-                ax.set_xlabel('Categories', color='white')
-                ax.tick_params(colors='white')
+            try:
+                if chart_type == "pie":
+                    # Pre-format percentages instead of an autopct callback per wedge
+                    percentages = values / values.sum() * 100
+                    display_labels = [f"{label}\n{pct:.1f}%" for label, pct in zip(labels, percentages)]
+                    wedges, texts = ax.pie(
+                        values, labels=display_labels, startangle=90,
+                        colors=colors, textprops={'color': 'white'}
+                    )
+                    setp(texts, size=12, fontname=text_font)
+                
+                elif chart_type == "bar":
+                    bars = ax.bar(labels, values, color=colors)
+                    ax.set_ylabel('Values', color='white')
+                    ax.set_xlabel('Categories', color='white')
+                    ax.tick_params(colors='white')
+                    
+                    # Add value labels on bars (only for positive values)
+                    ax.bar_label(bars, labels=[f'{v:g}' if v > 0 else '' for v in values],
+                                 padding=3, color='white', fontweight='bold')
                 
-                # Add value labels on bars
-                for bar, value in zip(bars, values):
-                    height = bar.get_height()
-                    if height > 0:  # Only add labels for positive values
-                        ax.text(bar.get_x() + bar.get_width()/2., height,
-                               f'{value}', ha='center', va='bottom', color='white', fontweight='bold')
+                elif chart_type == "line":
+                    ax.plot(labels, values, marker='o', linewidth=3, markersize=8, 
+                           color=_BRAND_RGB[0], markerfacecolor=_BRAND_RGB[1])
+                    ax.set_ylabel('Values', color='white')
+                    ax.set_xlabel('Categories', color='white')
+                    ax.tick_params(colors='white')
+                    ax.grid(True, alpha=0.3, color='white')
             
-            elif chart_type == "line":
-                ax.plot(labels, values, marker='o', linewidth=3, markersize=8, 
-                       color=BRAND_COLORS[0], markerfacecolor=BRAND_COLORS[1])
-                ax.set_ylabel('Values', color='white')
-                ax.set_xlabel('Categories', color='white')
-                ax.tick_params(colors='white')
-                ax.grid(True, alpha=0.3, color='white')
-        
-        except Exception as e:
-            print(f"Error creating {chart_type} chart: {str(e)}")
-            plt.close(fig)
+            except Exception as e:
+                logger.error("Error creating %s chart: %s", chart_type, e)
+                fig.clear()
+                return None
+            
+            ax.spines['bottom'].set_color('white')
+            ax.spines['top'].set_color('white')
+            ax.spines['right'].set_color('white')
+            ax.spines['left'].set_color('white')
+            
+            _CHART_BUFFER.seek(0)
+            _CHART_BUFFER.truncate(0)
+            # Encode the Agg buffer directly; fast zlib since the PPTX is zipped again anyway
+            fig.canvas.draw()
+            image = Image.frombuffer('RGBA', fig.canvas.get_width_height(),
+                                     fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+            image.save(_CHART_BUFFER, format='PNG', compress_level=1)
+            fig.clear()
+            png = _CHART_BUFFER.getvalue()
+        
+        _store_cached_chart(cache_key, png)
+        # add_picture reads to EOF, so hand out an independent buffer
+        return io.BytesIO(png)
+
+    def _add_native_chart(self, slide, chart_data, chart_type, left, top, width, height):
+        """Add an editable PowerPoint chart, styled like the matplotlib version"""
+        if not chart_data or 'labels' not in chart_data or 'values' not in chart_data:
             return None
+            
+        labels = chart_data['labels']
+        values = chart_data['values']
+        if not labels or not values:
+            return None
+            
+        try:
+            values = [float(v) if v is not None else 0 for v in values]
+        except (ValueError, TypeError):
+            return None
+            
+        # For pie charts, ensure we have positive values
+        if chart_type == "pie":
+            values = [abs(v) if v != 0 else 0.1 for v in values]
+        
+        count = min(len(labels), len(values))
+        data = CategoryChartData()
+        data.categories = [str(label) for label in labels[:count]]
+        data.add_series('Values', values[:count])
+        
+        chart = slide.shapes.add_chart(NATIVE_CHART_TYPES[chart_type], left, top, width, height, data).chart
+        chart.has_legend = False
+        chart.font.name = text_font
+        chart.font.size = Pt(12)
+        chart.font.color.rgb = DEFAULT_TEXT_COLOR
+        
+        plot = chart.plots[0]
+        series = plot.series[0]
+        if chart_type == "line":
+            series.format.line.color.rgb = hex_to_rgb(BRAND_COLORS[0])
+            series.format.line.width = Pt(3)
+            series.marker.style = XL_MARKER_STYLE.CIRCLE
+            series.marker.format.fill.solid()
+            series.marker.format.fill.fore_color.rgb = hex_to_rgb(BRAND_COLORS[1])
+            chart.value_axis.has_major_gridlines = True
+        else:
+            for idx, point in enumerate(series.points):
+                point.format.fill.solid()
+                point.format.fill.fore_color.rgb = hex_to_rgb(BRAND_COLORS[idx % len(BRAND_COLORS)])
+            
+            plot.has_data_labels = True
+            data_labels = plot.data_labels
+            data_labels.font.bold = True
+            data_labels.font.color.rgb = DEFAULT_TEXT_COLOR
+            if chart_type == "pie":
+                data_labels.number_format = '0.0%'
+                data_labels.number_format_is_linked = False
+                data_labels.show_value = False
+                data_labels.show_percentage = True
+                data_labels.show_category_name = True
+            else:
+                data_labels.position = XL_LABEL_POSITION.OUTSIDE_END
         
-        ax.spines['bottom'].set_color('white')
-        ax.spines['top'].set_color('white')
-        ax.spines['right'].set_color('white')
-        ax.spines['left'].set_color('white')
-        
-        plt.tight_layout()
-        chart_buffer = io.BytesIO()
-        plt.savefig(chart_buffer, format='png', bbox_inches='tight', 
-                   transparent=True, facecolor='none')
-        plt.close(fig)
-        chart_buffer.seek(0)
-        return chart_buffer
+        return chart
 
     def _create_data_table(self, slide, table_data, title="Data Table"):
         """Create a professional data table"""
@@ -227,17 +477,18 @@ class GeneralPresentation:
             return None
             
         headers = table_data['headers']
-        rows = table_data['rows']
+        num_cols = len(headers)
+        # Trim to the visible rows and columns once, up front
+        rows = [row_data[:num_cols] for row_data in table_data['rows'][:self.MAX_ROWS_PER_TABLE]]
         
         # Calculate table dimensions
-        num_cols = len(headers)
-        num_rows = min(len(rows) + 1, self.MAX_ROWS_PER_TABLE + 1)  # +1 for header
+        num_rows = len(rows) + 1  # +1 for header
         
         table_width = CONTENT_MAX_WIDTH * 0.8
-        table_height = Inches(0.4) * num_rows
+        table_height = TABLE_ROW_HEIGHT * num_rows
         
         table_left = SLIDE_MARGIN + (CONTENT_MAX_WIDTH - table_width) / 2
-        table_top = CONTENT_TOP + Inches(0.5)
+        table_top = CONTENT_TOP + TABLE_TOP_OFFSET
         
         table_left, table_top, table_width, table_height = ensure_content_fits(
             table_left, table_top, table_width, table_height
@@ -247,16 +498,28 @@ class GeneralPresentation:
         table = slide.shapes.add_table(num_rows, num_cols, table_left, table_top, 
                                      table_width, table_height).table
         
-        # Set headers
-        for i, header in enumerate(headers):
-            self._set_cell_style(table.cell(0, i), header, is_header=True)
-        
-        # Set data rows
-        for row_idx, row_data in enumerate(rows[:self.MAX_ROWS_PER_TABLE]):
-            is_dark = row_idx % 2 == 0
-            for col_idx, cell_data in enumerate(row_data[:num_cols]):
-                self._set_cell_style(table.cell(row_idx + 1, col_idx), 
-                                   str(cell_data), is_dark_row=is_dark)
+        # Build every row as one XML fragment instead of styling cells one by one
+        header_cell = _cell_xml_template(TABLE_HEADER_FONT_COLOR, self.title_bg_color, bold=True)
+        dark_cell = _cell_xml_template(self.body_text_color, ROW_COLOR_DARK)
+        light_cell = _cell_xml_template(self.body_text_color)
+        
+        rows_xml = [''.join(header_cell.format(text=_cell_text_xml(str(header))) for header in headers)]
+        for row_idx, row_data in enumerate(rows):
+            cell = dark_cell if row_idx % 2 == 0 else light_cell
+            cells = [cell.format(text=_cell_text_xml(str(cell_data))) for cell_data in row_data]
+            cells.extend([_EMPTY_CELL_XML] * (num_cols - len(cells)))
+            rows_xml.append(''.join(cells))
+        
+        tbl = table._tbl
+        row_height = tbl.tr_lst[0].get('h')
+        for tr in tbl.tr_lst:
+            tbl.remove(tr)
+        new_rows = parse_xml(
+            f'<a:tbl {nsdecls("a")}>'
+            + ''.join(f'<a:tr h="{row_height}">{cells}</a:tr>' for cells in rows_xml)
+            + '</a:tbl>'
+        )
+        tbl.extend(list(new_rows))
         
         return table
 
@@ -273,16 +536,13 @@ class GeneralPresentation:
         
         # Style title
         title_shape = slide.shapes.title
-        title_shape.text_frame.paragraphs[0].font.name = heading_font
-        title_shape.text_frame.paragraphs[0].font.size = Pt(36)
-        title_shape.text_frame.paragraphs[0].font.color.rgb = DEFAULT_TEXT_COLOR
-        title_shape.text_frame.paragraphs[0].font.bold = True
+        set_paragraph_font(title_shape.text_frame.paragraphs[0], heading_font,
+                           TITLE_SLIDE_FONT_SIZE, DEFAULT_TEXT_COLOR, bold=True)
         
         # Style subtitle
         subtitle_shape = slide.placeholders[1]
-        subtitle_shape.text_frame.paragraphs[0].font.name = text_font
-        subtitle_shape.text_frame.paragraphs[0].font.size = Pt(24)
-        subtitle_shape.text_frame.paragraphs[0].font.color.rgb = self.body_text_color
+        set_paragraph_font(subtitle_shape.text_frame.paragraphs[0], text_font,
+                           SUBTITLE_FONT_SIZE, self.body_text_color)
 
     def add_content_slide(self, slide_data):
         """Add a content slide with text, charts, and tables"""
@@ -301,7 +561,7 @@ class GeneralPresentation:
             text_left = SLIDE_MARGIN
             text_top = CONTENT_TOP
             text_width = CONTENT_MAX_WIDTH * 0.6  # Leave space for charts
-            text_height = Inches(3)
+            text_height = TEXT_BOX_HEIGHT
             
             text_left, text_top, text_width, text_height = ensure_content_fits(
                 text_left, text_top, text_width, text_height
@@ -316,24 +576,17 @@ class GeneralPresentation:
             if headline:
                 p = tf.paragraphs[0]
                 p.text = headline
-                p.font.name = key_font
-                p.font.size = Pt(20)
-                p.font.color.rgb = self.body_text_color
-                p.font.bold = True
+                set_paragraph_font(p, key_font, HEADLINE_FONT_SIZE, self.body_text_color, bold=True)
                 
                 # Add content as new paragraph
                 if content:
                     p2 = tf.add_paragraph()
                     p2.text = f"\n{content}"
-                    p2.font.name = text_font
-                    p2.font.size = self.font_size
-                    p2.font.color.rgb = self.body_text_color
+                    set_paragraph_font(p2, text_font, self.font_size, self.body_text_color)
             else:
                 p = tf.paragraphs[0]
                 p.text = content
-                p.font.name = text_font
-                p.font.size = self.font_size
-                p.font.color.rgb = self.body_text_color
+                set_paragraph_font(p, text_font, self.font_size, self.body_text_color)
         
         # Add chart if data is available
         chart_data = slide_data.get('chartData')
@@ -341,19 +594,23 @@ class GeneralPresentation:
         
         if chart_data:
             try:
-                chart_image = self._create_data_chart(chart_data, chart_type)
-                if chart_image:
-                    chart_width, chart_height = calculate_chart_size()
-                    chart_left = SLIDE_WIDTH - chart_width - SLIDE_MARGIN
-                    chart_top = CONTENT_TOP
-                    
-                    chart_left, chart_top, chart_width, chart_height = ensure_content_fits(
-                        chart_left, chart_top, chart_width, chart_height
-                    )
-                    
-                    slide.shapes.add_picture(chart_image, chart_left, chart_top, width=chart_width)
+                chart_width, chart_height = calculate_chart_size()
+                chart_left = SLIDE_WIDTH - chart_width - SLIDE_MARGIN
+                chart_top = CONTENT_TOP
+                
+                chart_left, chart_top, chart_width, chart_height = ensure_content_fits(
+                    chart_left, chart_top, chart_width, chart_height
+                )
+                
+                if self.native_charts and chart_type in NATIVE_CHART_TYPES:
+                    self._add_native_chart(slide, chart_data, chart_type,
+                                           chart_left, chart_top, chart_width, chart_height)
+                else:
+                    chart_image = self._create_data_chart(chart_data, chart_type)
+                    if chart_image:
+                        slide.shapes.add_picture(chart_image, chart_left, chart_top, width=chart_width)
             except Exception as e:
-                print(f"Warning: Could not create chart for slide: {str(e)}")
+                logger.warning("Could not create chart for slide: %s", e)
                 # Continue without chart
         
         # Add table if data is available
@@ -384,27 +641,19 @@ class GeneralPresentation:
         # Summary content
         p = tf.paragraphs[0]
         p.text = "Summary of Key Findings:"
-        p.font.name = key_font
-        p.font.size = Pt(20)
-        p.font.color.rgb = self.body_text_color
-        p.font.bold = True
+        set_paragraph_font(p, key_font, HEADLINE_FONT_SIZE, self.body_text_color, bold=True)
         
         # Add key points from slides
         for i, slide_data in enumerate(slides[:4]):  # Max 4 key points
             p_bullet = tf.add_paragraph()
             title = slide_data.get('title', f'Point {i+1}')
             p_bullet.text = f"• {title}: Strategic importance for business growth"
-            p_bullet.font.name = text_font
-            p_bullet.font.size = self.font_size
-            p_bullet.font.color.rgb = self.body_text_color
+            set_paragraph_font(p_bullet, text_font, self.font_size, self.body_text_color)
         
         # Next steps
         p_next = tf.add_paragraph()
         p_next.text = "\nRecommended Next Steps:"
-        p_next.font.name = key_font
-        p_next.font.size = Pt(18)
-        p_next.font.color.rgb = self.body_text_color
-        p_next.font.bold = True
+        set_paragraph_font(p_next, key_font, SUBHEADING_FONT_SIZE, self.body_text_color, bold=True)
         
         next_steps = [
             "Develop detailed implementation roadmap",
@@ -416,26 +665,24 @@ class GeneralPresentation:
         for step in next_steps:
             p_step = tf.add_paragraph()
             p_step.text = f"• {step}"
-            p_step.font.name = text_font
-            p_step.font.size = self.font_size
-            p_step.font.color.rgb = self.body_text_color
+            set_paragraph_font(p_step, text_font, self.font_size, self.body_text_color)
 
-def create_general_presentation(data, search_phrase="Business Analysis", customization=None):
+def create_general_presentation(data, search_phrase="Business Analysis", customization=None, native_charts=False):
     """Main function to create a general business presentation"""
     try:
-        print(f"DEBUG: Input data type: {type(data)}")
-        print(f"DEBUG: Input data content: {data}")
+        logger.debug("Input data type: %s", type(data))
+        logger.debug("Input data content: %s", data)
         
         # Ensure data is parsed if it's a JSON string
         if isinstance(data, str):
             try:
                 data = json.loads(data)
-                print(f"DEBUG: Parsed JSON data: {data}")
+                logger.debug("Parsed JSON data: %s", data)
             except json.JSONDecodeError as e:
-                print(f"DEBUG: JSON parsing error: {str(e)}")
+                logger.debug("JSON parsing error: %s", e)
                 raise ValueError("Input data is not valid JSON.")
 
-        presentation = GeneralPresentation(data, search_phrase, customization)
+        presentation = GeneralPresentation(data, search_phrase, customization, native_charts)
         
         # Add title slide
         presentation.add_title_slide()
@@ -461,5 +708,29 @@ def create_general_presentation(data, search_phrase="Business Analysis", customi
         return presentation.prs
         
     except Exception as e:
-        print(f"Error creating presentation: {str(e)}")
+        logger.error("Error creating presentation: %s", e)
         return None
+
+def render_general_presentation(data, search_phrase="Business Analysis", customization=None, native_charts=False):
+    """Create a general business presentation and return it as PPTX bytes"""
+    prs = create_general_presentation(data, search_phrase, customization, native_charts)
+    if prs is None:
+        return None
+    output = io.BytesIO()
+    prs.save(output)
+    release_presentation(prs)
+    return output.getvalue()
+
+def _render_batch_item(item):
+    """Process pool entry point for (data, search_phrase[, customization]) tuples"""
+    return render_general_presentation(*item)
+
+def create_general_presentations_batch(items, max_workers=None):
+    """Create many presentations in parallel worker processes.
+
+    Each item is a (data, search_phrase) or (data, search_phrase, customization)
+    tuple. Results are PPTX bytes (or None for failures) in input order, since
+    live Presentation objects cannot be pickled back from the workers.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_render_batch_item, items))
@@ -1,37 +1,84 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES, GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, ConfigDict, ValidationError
 import uvicorn
+import asyncio
+import multiprocessing
 import json
+import re
+import orjson
 import tempfile
 import os
 import logging
-import shutil
 import time
+import uuid
+import hashlib
+import zipfile
+import anyio
 import httpx
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
-from pptx import Presentation
 import io
-from general_presentation import create_general_presentation  # Main generator with charts
+from urllib.parse import quote
+from email.utils import formatdate
+from general_presentation import create_general_presentation, release_presentation, render_general_presentation  # Main generator with charts
 
-def is_valid_pptx(file_content: bytes) -> bool:
-    """Validate if the byte content is a valid PPTX file."""
-    if not file_content:
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+SAFE_FILENAME = str.maketrans(" ", "_")  # spaces -> underscores in download names
+
+FORM_TEMPLATE = Path("templates/form.html")
+PPTX_DIR = "/tmp"  # where downloadable decks live; scanned by cleanup_old_files
+
+# Parts every PPTX package must contain
+PPTX_REQUIRED_PARTS = {"[Content_Types].xml", "ppt/presentation.xml"}
+
+def _is_valid_pptx_stream(stream) -> bool:
+    """Validate a seekable PPTX stream from its ZIP signature and part list."""
+    signature = stream.read(4)
+    if not signature:
         logger.error("Validation failed: File content is empty.")
         return False
+    if signature != b"PK\x03\x04":
+        logger.error("Validation failed: The file is not a ZIP package.")
+        return False
+    stream.seek(0)
     try:
-        # Use BytesIO to treat the byte content as a file
-        file_stream = io.BytesIO(file_content)
-        # Try to open the presentation. If it fails, it's corrupted.
-        Presentation(file_stream)
-        logger.info("PPTX validation successful.")
-        return True
-    except Exception as e:
-        logger.error(f"Validation failed: The file is not a valid PPTX package or is corrupted: {e}")
+        # Only the central directory is read; slide XML is not parsed
+        with zipfile.ZipFile(stream) as package:
+            part_names = set(package.namelist())
+    # Truncated or malformed archives can surface as any of these, not only BadZipFile
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, ValueError, OSError, EOFError, KeyError) as e:
+        logger.error("Validation failed: The file is not a valid PPTX package or is corrupted: %s", e)
         return False
+    if not PPTX_REQUIRED_PARTS.issubset(part_names):
+        logger.error("Validation failed: The package is missing required PPTX parts.")
+        return False
+    logger.info("PPTX validation successful.")
+    return True
+
+def is_valid_pptx(file_content: bytes) -> bool:
+    """Validate if the byte content is a valid PPTX file."""
+    return _is_valid_pptx_stream(io.BytesIO(file_content))
+
+def is_valid_pptx_file(file_path: str) -> bool:
+    """Validate if the file on disk is a valid PPTX file."""
+    with open(file_path, "rb") as f:
+        return _is_valid_pptx_stream(f)
+
+def content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header, RFC 5987-encoding non-ASCII names."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
 
 def create_presentation_with_real_charts(data, output_path):
     """
@@ -54,14 +101,15 @@ def create_presentation_with_real_charts(data, output_path):
         presentation = create_general_presentation(data, search_phrase)
         if presentation:
             presentation.save(output_path)
-            logger.info(f"Successfully created presentation with real charts: {output_path}")
+            release_presentation(presentation)
+            logger.info("Successfully created presentation with real charts: %s", output_path)
             return True
         else:
             logger.error("general_presentation failed to create presentation")
             return False
             
     except Exception as e:
-        logger.error(f"Error in chart presentation creation: {str(e)}")
+        logger.error("Error in chart presentation creation: %s", e)
         return False
 
 # Load environment variables
@@ -70,26 +118,109 @@ load_dotenv()
 # Configuration
 DOWNLOAD_BASE_URL = os.getenv("DOWNLOAD_BASE_URL", "https://slider.sd-ai.co.uk")
 N8N_WEBHOOK_URL = "https://sd-n8n.duckdns.org/webhook/slider"  # Production webhook
+HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100, keepalive_expiry=30.0)
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes per read when saving n8n files
+CLEANUP_INTERVAL = 600  # seconds between /tmp rescans
+# CPUs this process may run on; unlike os.cpu_count() this honours cpuset/taskset limits
+AVAILABLE_CPUS = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+# Worker threads for blocking file I/O; never below anyio's default of 40, since download
+# reads, n8n writes, validation and cleanup all share this one limiter
+WORKER_THREADS = max(40, 2 * AVAILABLE_CPUS)
+# uvicorn worker processes. One by default: the dedup guard, the rendered-deck cache and
+# in-flight render sharing are per process, and CPU-bound rendering already runs in
+# RENDER_PROCESSES; set WEB_CONCURRENCY to scale out explicitly
+WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))
+# Deck rendering processes per uvicorn worker, so WORKERS x RENDER_PROCESSES in total; by
+# default each worker gets an equal share of the available CPUs. Each is a spawned
+# interpreter that re-imports this module and, on the first chart, matplotlib.
+RENDER_PROCESSES = int(os.getenv("RENDER_PROCESSES", max(1, AVAILABLE_CPUS // WORKERS)))
 
 # Pydantic models for request validation
 class CustomizationOptions(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     slide_bg_color: str = "#0F1632"
     title_font_color: str = "#FFFFFF"
     title_bg_color: str = "#44546A"
     body_text_color: str = "#FFFFFF"
     title_position: str = "left"
     font_size: int = 16
+    native_charts: bool = False  # editable PowerPoint charts instead of matplotlib images
 
 class SlideGenerationRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     search_phrase: str
     number_of_slides: int = 5  # Default to 5 slides
     customization: CustomizationOptions = None
 
+class PresentationRequest(BaseModel):
+    """Body of /create-presentation; without a 'data' field the whole body is the slide data"""
+    model_config = ConfigDict(extra="allow")
+
+    search_phrase: str = "Analysis"
+    data: dict | str | None = None
+    customization: dict | None = None
+
+# orjson only handles 64-bit integers: wider ones fail to dump and silently load as floats,
+# so those (rare) documents go through the stdlib json module instead
+_WIDE_INT = re.compile(r"\d{19}")
+_WIDE_INT_BYTES = re.compile(rb"\d{19}")
+
+def json_dumps(value, sort_keys: bool = False) -> bytes:
+    """Serialize to JSON bytes with orjson, or stdlib json for integers wider than 64 bits"""
+    try:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    except orjson.JSONEncodeError:
+        return json.dumps(value, sort_keys=sort_keys, separators=(",", ":"), default=str).encode()
+
+def json_loads(data: bytes | str):
+    """Parse JSON with orjson, or stdlib json if the text may hold integers wider than 64 bits"""
+    wide_int = _WIDE_INT_BYTES if isinstance(data, bytes) else _WIDE_INT
+    if wide_int.search(data):
+        return json.loads(data)
+    return orjson.loads(data)
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson"""
+    def render(self, content) -> bytes:
+        return json_dumps(content)
+
+def error_response(message: str, status_code: int, status: str = "error") -> ORJSONResponse:
+    """Error body in the {"error", "status"} shape with a matching HTTP status code"""
+    return ORJSONResponse({"error": message, "status": status}, status_code=status_code)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="PowerPoint Slide Generator")
+def start_render_pool() -> ProcessPoolExecutor:
+    """Start the deck rendering processes"""
+    # python-pptx and matplotlib hold the GIL, so decks render in separate processes;
+    # spawn avoids forking a process that is already running the event loop's threads
+    pool = ProcessPoolExecutor(max_workers=RENDER_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+    # Start the render processes now rather than on the first request
+    for _ in range(RENDER_PROCESSES):
+        pool.submit(int)
+    return pool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the cleanup loop and share one HTTP client and render pool across requests"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = WORKER_THREADS
+    app.state.render_pool = start_render_pool()
+    app.state.form_html, app.state.form_etag = load_form_html()
+    app.state.http_client = httpx.AsyncClient(timeout=None, limits=HTTP_LIMITS, http2=True)
+    cleanup_task = asyncio.create_task(periodic_cleanup())
+    logger.info("Application started")
+    try:
+        yield
+    finally:
+        cleanup_task.cancel()
+        await app.state.http_client.aclose()
+        app.state.render_pool.shutdown(wait=False, cancel_futures=True)
+
+app = FastAPI(title="PowerPoint Slide Generator", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -100,157 +231,300 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON and HTML responses; PPTX files are already ZIP-compressed
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=500,
+    compresslevel=4,
+    exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + (PPTX_MIME,),
+)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 def cleanup_old_files():
-    """Clean up old PPTX files from /tmp directory"""
+    """Clean up old PPTX files from PPTX_DIR"""
     try:
         current_time = time.time()
-        for filename in os.listdir("/tmp"):
-            if filename.startswith("pptx_") or filename.endswith(".pptx"):
-                file_path = f"/tmp/{filename}"
-                # Remove files older than 1 hour
-                if current_time - os.path.getctime(file_path) > 3600:
-                    os.remove(file_path)
-                    logger.info(f"Cleaned up old file: {filename}")
+        with os.scandir(PPTX_DIR) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("pptx_") or entry.name.endswith(".pptx")):
+                    continue
+                try:
+                    # Remove files older than 1 hour
+                    if current_time - entry.stat().st_ctime > 3600:
+                        os.remove(entry.path)
+                        logger.info("Cleaned up old file: %s", entry.name)
+                except FileNotFoundError:
+                    # Already removed by another worker or a finished download
+                    continue
     except Exception as e:
-        logger.error(f"Error during cleanup: {str(e)}")
+        logger.error("Error during cleanup: %s", e)
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Serve the main form page"""
+async def periodic_cleanup():
+    """Run cleanup_old_files now and every CLEANUP_INTERVAL seconds, off the event loop"""
+    # The first pass runs in the background so startup does not wait on a large /tmp
+    while True:
+        await anyio.to_thread.run_sync(cleanup_old_files)
+        await asyncio.sleep(CLEANUP_INTERVAL)
+
+def load_form_html():
+    """Read the form page once; returns (content, etag) or (None, None) if missing"""
     try:
-        with open("templates/form.html", "r") as f:
-            return f.read()
+        content = FORM_TEMPLATE.read_bytes()
     except FileNotFoundError:
+        logger.error("Template not found: %s", FORM_TEMPLATE)
+        return None, None
+    return content, f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Serve the main form page"""
+    form_html = request.app.state.form_html
+    if form_html is None:
         return HTMLResponse(content="<h1>Template not found</h1>", status_code=500)
+    # Let browsers revalidate with the ETag instead of re-downloading the page
+    headers = {"ETag": request.app.state.form_etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), request.app.state.form_etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=form_html, headers=headers)
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """Weak ETag from a file's size and modification time"""
+    return f'W/"{stat_result.st_size:x}-{int(stat_result.st_mtime):x}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an If-None-Match header value covers etag"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+def open_for_download(file_path: str):
+    """Open file_path and stat the open descriptor, so a concurrent delete cannot break the send"""
+    f = open(file_path, "rb")
+    try:
+        return f, os.fstat(f.fileno())
+    except BaseException:
+        f.close()
+        raise
 
-@app.get("/download/{filename}")
-async def download_file(filename: str):
+class RangeNotSatisfiable(Exception):
+    """A Range header that selects no bytes of the file"""
+
+def parse_byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Inclusive (start, end) for a single bytes= range, or None to send the whole file.
+
+    Multiple or malformed ranges are ignored, as RFC 9110 allows; a range starting
+    past the end of the file raises RangeNotSatisfiable.
+    """
+    unit, _, spec = range_header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not dash or "," in spec:
+        return None
+    if not (first.isdigit() or first == "") or not (last.isdigit() or last == "") or first == last == "":
+        return None
+    if first == "":
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, (min(int(last), size - 1) if last else size - 1)
+
+async def iter_open_file(f, offset: int, length: int):
+    """Yield length bytes of an open file from offset in STREAM_CHUNK_SIZE chunks, reading
+    off the event loop, then close it"""
+    try:
+        if offset:
+            await anyio.to_thread.run_sync(f.seek, offset)
+        while length > 0:
+            chunk = await anyio.to_thread.run_sync(f.read, min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+@app.api_route("/download/{filename}", methods=["GET", "HEAD"])
+async def download_file(filename: str, request: Request):
     """Download the generated PowerPoint file"""
     try:
         # Handle both old and new file naming schemes
         if filename.startswith("pptx_"):
-            file_path = f"/tmp/{filename}"
+            file_path = f"{PPTX_DIR}/{filename}"
         else:
             # Legacy support for old naming
-            file_path = f"/tmp/{filename}"
+            file_path = f"{PPTX_DIR}/{filename}"
 
-        logger.info(f"Attempting to download file: {file_path}")
+        logger.info("Attempting to download file: %s", file_path)
 
-        if not os.path.exists(file_path):
-            logger.error(f"File not found: {file_path}")
-            return {"error": "File not found", "status": "error"}
+        # Open once and fstat the descriptor, off the event loop; the response streams
+        # from this handle, so the cleanup sweeper deleting the path cannot race it
+        try:
+            f, stat_result = await anyio.to_thread.run_sync(open_for_download, file_path)
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
+            return error_response("File not found", 404)
 
-        # Check file size to ensure it's not empty
-        file_size = os.path.getsize(file_path)
-        logger.info(f"File size: {file_size} bytes")
+        # Until the StreamingResponse owns the handle, every exit path must close it
+        streaming = False
+        try:
+            # Check file size to ensure it's not empty
+            file_size = stat_result.st_size
+            logger.info("File size: %s bytes", file_size)
 
-        if file_size == 0:
-            logger.error(f"File is empty: {file_path}")
-            return {"error": "Generated file is empty", "status": "error"}
+            etag = file_etag(stat_result)
+            headers = {
+                "Content-Length": str(file_size),
+                "Content-Disposition": content_disposition("slides.pptx"),
+                "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+                "ETag": etag,
+                "Accept-Ranges": "bytes",
+            }
 
-        return FileResponse(
-            file_path,
-            filename="slides.pptx",
-            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-        )
+            if file_size == 0:
+                logger.error("File is empty: %s", file_path)
+                return error_response("Generated file is empty", 500)
 
-    except Exception as e:
-        logger.error(f"Error downloading file: {str(e)}")
-        return {"error": f"Failed to download file: {str(e)}", "status": "error"}
+            # Let clients revalidate a copy they already have instead of re-downloading it
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+            if request.method == "HEAD":
+                return Response(media_type=PPTX_MIME, headers=headers)
+
+            # Honour a single byte range (resumed downloads), as FileResponse did; If-Range
+            # falls back to the whole file once the validator no longer matches
+            start, end, status_code = 0, file_size - 1, 200
+            range_header = request.headers.get("range")
+            if_range = request.headers.get("if-range")
+            if range_header and (not if_range or if_range in (etag, headers["Last-Modified"])):
+                try:
+                    byte_range = parse_byte_range(range_header, file_size)
+                except RangeNotSatisfiable:
+                    response = error_response("Requested range not satisfiable", 416)
+                    response.headers["Content-Range"] = f"bytes */{file_size}"
+                    return response
+                if byte_range:
+                    start, end = byte_range
+                    status_code = 206
+                    headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+                    headers["Content-Length"] = str(end - start + 1)
 
-@app.on_event("startup")
-async def startup_event():
-    """Clean up old files on startup"""
-    cleanup_old_files()
-    logger.info("Application started and old files cleaned up")
+            response = StreamingResponse(iter_open_file(f, start, end - start + 1), status_code=status_code,
+                                         media_type=PPTX_MIME, headers=headers)
+            streaming = True
+            return response
+        finally:
+            if not streaming:
+                f.close()
 
-# Request deduplication tracking
-recent_requests = {}
+    except Exception as e:
+        logger.error("Error downloading file: %s", e)
+        return error_response(f"Failed to download file: {str(e)}", 500)
+
+# Request deduplication tracking; entries expire after the cooldown.
+# Each worker process keeps its own cache, so this is best-effort across workers.
 REQUEST_COOLDOWN = 3  # seconds
+recent_requests = TTLCache(maxsize=10_000, ttl=REQUEST_COOLDOWN)
+
+def request_fingerprint(search_phrase: str, number_of_slides: int, customization: dict | None) -> bytes:
+    """Hash the fields that make two slide requests duplicates"""
+    key = json_dumps([search_phrase, number_of_slides, customization], sort_keys=True)
+    return hashlib.blake2b(key, digest_size=16).digest()
 
 @app.post("/generate-slides-from-search")
-async def generate_slides_from_search(request: SlideGenerationRequest):
+async def generate_slides_from_search(request: SlideGenerationRequest, http_request: Request):
     """Generate PowerPoint slides by triggering n8n webhook and return the file"""
-    global recent_requests
-    current_time = time.time()
-    request_id = f"{request.search_phrase}_{int(current_time)}"
+    # Monotonic clock for the cooldown so wall-clock jumps cannot skew it
+    current_time = time.monotonic()
+    request_id = uuid.uuid4().hex[:8]
     
-    # Deduplication check with more precise timing
-    request_key = f"{request.search_phrase}_{request.number_of_slides}"
+    customization = request.customization.model_dump() if request.customization else None
     
-    if request_key in recent_requests:
-        time_diff = current_time - recent_requests[request_key]
-        if time_diff < REQUEST_COOLDOWN:
-            logger.warning(f"[{request_id}] DUPLICATE REQUEST BLOCKED: Same request made {time_diff:.2f}s ago")
-            return {"error": f"Duplicate request detected. Please wait {REQUEST_COOLDOWN - time_diff:.1f} seconds before trying again.", "status": "rate_limited"}
+    # Deduplication check; no await between lookup and insert, so no lock is needed
+    request_key = request_fingerprint(request.search_phrase, request.number_of_slides, customization)
     
-    recent_requests[request_key] = current_time
+    # One lookup: a separate membership test and read could straddle the entry's expiry
+    last_seen = recent_requests.get(request_key)
+    if last_seen is not None:
+        time_diff = current_time - last_seen
+        logger.warning("[%s] DUPLICATE REQUEST BLOCKED: Same request made %.2fs ago", request_id, time_diff)
+        return error_response(f"Duplicate request detected. Please wait {REQUEST_COOLDOWN - time_diff:.1f} seconds before trying again.", 429, "rate_limited")
     
-    # Clean up old entries (older than 10 seconds)
-    cutoff_time = current_time - 10
-    recent_requests = {k: v for k, v in recent_requests.items() if v > cutoff_time}
+    recent_requests[request_key] = current_time
     
     try:
-        logger.info(f"[{request_id}] NEW REQUEST: Triggering n8n webhook for: {request.search_phrase}, {request.number_of_slides} slides")
+        logger.info("[%s] NEW REQUEST: Triggering n8n webhook for: %s, %s slides", request_id, request.search_phrase, request.number_of_slides)
         
         # Prepare payload for n8n webhook
         webhook_payload = {
             "search_phrase": request.search_phrase,
             "number_of_slides": request.number_of_slides,
-            "customization": request.customization.dict() if request.customization else None,
-            "timestamp": current_time
+            "customization": customization,
+            "timestamp": time.time()
         }
         
-        logger.info(f"[{request_id}] Sending to n8n: {webhook_payload}")
+        logger.debug("[%s] Sending to n8n: %s", request_id, webhook_payload)
         
         # Trigger n8n webhook and expect binary file response
-        async with httpx.AsyncClient(timeout=None) as client:
-            try:
-                response = await client.post(N8N_WEBHOOK_URL, json=webhook_payload)
-
-                # --- TEMPORARY LOGGING START ---
-                # logger.info(f"N8N_RESPONSE_STATUS: {response.status_code}")
-                # logger.info(f"N8N_RESPONSE_HEADERS: {response.headers}")
-                # logger.info(f"N8N_RESPONSE_BODY (first 200 bytes): {response.content[:200]}")
-                # --- TEMPORARY LOGGING END ---
-                
+        client = http_request.app.state.http_client
+        try:
+            async with client.stream("POST", N8N_WEBHOOK_URL, content=json_dumps(webhook_payload),
+                                     headers={"content-type": "application/json"}) as response:
                 response.raise_for_status()
                 
-                logger.info(f"[{request_id}] n8n response received, status: {response.status_code}")
+                logger.info("[%s] n8n response received, status: %s", request_id, response.status_code)
                 
                 # Check if response is binary (PowerPoint file)
-                content_type = response.headers.get('content-type', '')
-                if 'application/vnd.openxmlformats-officedocument.presentationml.presentation' in content_type:
+                # Media types are case-insensitive and may carry parameters (e.g. charset)
+                content_type = response.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+                if content_type == PPTX_MIME:
                     # Return the PowerPoint file directly
-                    logger.info(f"[{request_id}] Received PowerPoint file from n8n webhook, returning file")
-                    
-                    # --- VALIDATION STEP ---
-                    if not is_valid_pptx(response.content):
-                        logger.error(f"[{request_id}] Validation failed: Received corrupted file from n8n.")
-                        return {
-                            "error": "Received a corrupted presentation file from the generation service. Please try again.",
-                            "status": "error"
-                        }
-                    # --- END VALIDATION ---
-
-                    filename = f"{request.search_phrase.replace(' ', '_')}_Analysis.pptx"
+                    logger.info("[%s] Received PowerPoint file from n8n webhook, returning file", request_id)
                     
-                    # Save temporarily to return as FileResponse
-                    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-                        tmp.write(response.content)
+                    # Stream the body to disk in chunks rather than buffering it, writing off the
+                    # event loop. mkstemp creates the file O_EXCL and 0600, since decks may hold
+                    # customer data; the pptx_ prefix in PPTX_DIR lets cleanup_old_files find strays
+                    fd, tmp_path = await anyio.to_thread.run_sync(tempfile.mkstemp, ".pptx", "pptx_", PPTX_DIR)
+                    try:
+                        async with anyio.wrap_file(os.fdopen(fd, "wb")) as tmp:
+                            async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                                await tmp.write(chunk)
                         
-                        return FileResponse(
-                            path=tmp.name,
-                            filename=filename,
-                            media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-                        )
+                        # --- VALIDATION STEP ---
+                        if not await anyio.to_thread.run_sync(is_valid_pptx_file, tmp_path):
+                            logger.error("[%s] Validation failed: Received corrupted file from n8n.", request_id)
+                            os.unlink(tmp_path)
+                            return error_response("Received a corrupted presentation file from the generation service. Please try again.", 502)
+                        # --- END VALIDATION ---
+                    except BaseException:
+                        # A dropped or cancelled transfer must not leave a partial deck behind
+                        os.unlink(tmp_path)
+                        raise
+
+                    filename = f"{request.search_phrase.translate(SAFE_FILENAME)}_Analysis.pptx"
+                    
+                    # Delete the tempfile once the response has been sent
+                    return FileResponse(
+                        path=tmp_path,
+                        filename=filename,
+                        media_type=PPTX_MIME,
+                        background=BackgroundTask(os.unlink, tmp_path)
+                    )
                 else:
                     # Handle JSON response (fallback)
-                    webhook_result = response.json()
-                    logger.info(f"n8n webhook returned JSON: {webhook_result}")
+                    webhook_result = json_loads(await response.aread())
+                    # Full n8n bodies can be large; only summarise them at INFO
+                    logger.info("[%s] n8n webhook returned JSON", request_id)
+                    logger.debug("[%s] n8n webhook JSON: %s", request_id, webhook_result)
                     
                     return {
                         "status": "success",
@@ -259,162 +533,224 @@ async def generate_slides_from_search(request: SlideGenerationRequest):
                         "search_phrase": request.search_phrase,
                         "number_of_slides": request.number_of_slides
                     }
-                    
-            except httpx.HTTPError as e:
-                logger.error(f"Error calling n8n webhook: {e}")
-                return {"error": f"Failed to trigger n8n webhook: {str(e)}", "status": "error"}
+                
+        except httpx.HTTPError as e:
+            logger.error("Error calling n8n webhook: %s", e)
+            return error_response(f"Failed to trigger n8n webhook: {str(e)}", 502)
 
     except Exception as e:
-        logger.error(f"Error in slide generation: {str(e)}")
-        return {"error": f"Failed to generate presentation: {str(e)}", "status": "error"}
+        logger.error("Error in slide generation: %s", e)
+        return error_response(f"Failed to generate presentation: {str(e)}", 500)
+
+# --- Legacy ESG format conversion ---
+def _esg_executive_summary_slide(exec_summary, search_phrase):
+    """Executive summary slide from the legacy executiveSummary field"""
+    if isinstance(exec_summary, dict):
+        key_finding = exec_summary.get('keyFinding', 'Key business findings and insights')
+    else:
+        key_finding = str(exec_summary) if exec_summary else 'Key business findings and insights'
+    return {
+        "title": f"Executive Summary: {search_phrase}",
+        "headline": "Key Business Overview",
+        "content": f"• {key_finding}\n• Market opportunities and strategic implications\n• Risk assessment and mitigation strategies\n• Recommended next steps for implementation"
+    }
+
+def _esg_impact_analysis_slide(impact, search_phrase):
+    """Impact analysis slide from the legacy impactAnalysis field"""
+    financial = impact.get('financial', 'Positive ROI expected') if isinstance(impact, dict) else 'Positive ROI expected'
+    return {
+        "title": "Impact Analysis",
+        "headline": "Business Impact Assessment",
+        "content": f"• Financial impact: {financial}\n• Operational efficiency improvements\n• Strategic positioning advantages\n• Long-term business sustainability"
+    }
+
+def _esg_regional_data_slide(regional_data, search_phrase):
+    """Market analysis slide from the legacy regionalData field; skipped when empty"""
+    if not regional_data:
+        return None
+    if isinstance(regional_data, list):
+        regional = regional_data[0] if isinstance(regional_data[0], dict) else {}
+    elif isinstance(regional_data, dict):
+        regional = regional_data
+    else:
+        regional = {}
+    return {
+        "title": "Market Analysis",
+        "headline": "Regional and Market Insights",
+        "content": f"• Region: {regional.get('region', 'Global market')}\n• Growth trends: {regional.get('trend', 'Positive growth trajectory')}\n• Market drivers and opportunities\n• Competitive landscape assessment"
+    }
+
+# Legacy field -> slide builder, in slide order
+_ESG_SLIDE_SPECS = (
+    ("executiveSummary", _esg_executive_summary_slide),
+    ("impactAnalysis", _esg_impact_analysis_slide),
+    ("regionalData", _esg_regional_data_slide),
+)
+
+def _esg_slides(data, search_phrase):
+    """Slides for a legacy ESG payload, one per field present in _ESG_SLIDE_SPECS"""
+    logger.info("Converting old ESG format to general slides")
+    slides = []
+    for key, build_slide in _ESG_SLIDE_SPECS:
+        if key in data:
+            slide = build_slide(data[key], search_phrase)
+            if slide:
+                slides.append(slide)
+    return slides
+
+def _summary_slides(data, search_phrase):
+    """A single overview slide built from whatever top-level keys the payload has"""
+    available_keys = [k for k in data.keys() if k not in ['search_phrase', 'number_of_slides', 'timestamp']]
+    content_points = []
+    
+    for key in available_keys[:4]:  # Take up to 4 keys
+        value = data.get(key, "")
+        if isinstance(value, (str, int, float)) and str(value).strip():
+            content_points.append(f"• {key.replace('_', ' ').title()}: {str(value)[:100]}")
+        elif isinstance(value, dict) and value:
+            content_points.append(f"• {key.replace('_', ' ').title()}: Analysis available")
+        elif isinstance(value, list) and value:
+            content_points.append(f"• {key.replace('_', ' ').title()}: {len(value)} items identified")
+    
+    if not content_points:
+        content_points = [
+            f"• Comprehensive analysis of {search_phrase}",
+            "• Strategic business opportunities identified",
+            "• Risk assessment and mitigation strategies",
+            "• Implementation roadmap and recommendations"
+        ]
+    
+    return [
+        {
+            "title": f"Business Analysis: {search_phrase}",
+            "headline": "Comprehensive Business Intelligence",
+            "content": "\n".join(content_points)
+        }
+    ]
+
+# Marker key -> slide builder for payloads without a 'slides' list, checked in order
+_SLIDE_DATA_HANDLERS = (
+    ("executiveSummary", _esg_slides),
+)
+
+def normalize_slide_data(data, search_phrase):
+    """Return data in {"slides": [...]} form, converting legacy payload shapes"""
+    if "slides" in data:
+        return data
+    logger.warning("No 'slides' key found in data. Available keys: %s", list(data.keys()))
+    for key, build_slides in _SLIDE_DATA_HANDLERS:
+        if key in data:
+            return {"slides": build_slides(data, search_phrase)}
+    return {"slides": _summary_slides(data, search_phrase)}
+
+# Rendered decks keyed by input, so n8n retries of the same payload skip the render.
+# Bounded by total bytes; like recent_requests, each worker process has its own cache,
+# so worst-case memory is WORKERS x RENDER_CACHE_MB. 0 disables the cache.
+RENDER_CACHE_BYTES = int(os.getenv("RENDER_CACHE_MB", 32)) * 1024 * 1024
+rendered_decks = LRUCache(maxsize=RENDER_CACHE_BYTES, getsizeof=len)
+pending_renders = {}  # render_key -> future of the render in progress
+
+def render_key(data, search_phrase: str, customization: dict | None) -> bytes:
+    """Hash everything that affects the rendered deck"""
+    key = json_dumps([data, search_phrase, customization], sort_keys=True)
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+async def render_in_pool(state, *args):
+    """Run render_general_presentation in state.render_pool, replacing the pool if it broke"""
+    pool = state.render_pool
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, render_general_presentation, *args)
+    except BrokenProcessPool:
+        # A render process that dies (OOM kill, native crash) breaks the executor for good;
+        # fail the renders it held, but give later requests a fresh pool
+        if state.render_pool is pool:
+            logger.error("A render process died; starting a new render pool")
+            state.render_pool = start_render_pool()
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+async def render_once(key: bytes, state, data, search_phrase, customization):
+    """Render in the pool, sharing one render between concurrent identical requests"""
+    future = pending_renders.get(key)
+    if future is None:
+        future = asyncio.ensure_future(render_in_pool(
+            state, data, search_phrase, customization,
+            bool(customization and customization.get("native_charts"))))
+        pending_renders[key] = future
+        future.add_done_callback(lambda _: pending_renders.pop(key, None))
+    else:
+        logger.info("Joining in-flight render of an identical request")
+    # A disconnecting client must not cancel the render other requests are waiting on
+    return await asyncio.shield(future)
 
 @app.post("/create-presentation")
-async def create_presentation(content_data: dict):
+async def create_presentation(request: Request):
     """Direct endpoint for n8n to create general business presentations - returns file directly"""
+    # Parse and validate the raw body in one pass with pydantic-core
     try:
-        search_phrase = content_data.get("search_phrase", "Analysis")
-        logger.info(f"Creating general presentation for: {search_phrase}")
+        payload = PresentationRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        logger.error("Invalid request body: %s", e)
+        return error_response(f"Invalid request body: {e.errors(include_url=False)[0]['msg']}", 400)
+    
+    try:
+        search_phrase = payload.search_phrase
+        logger.info("Creating general presentation for: %s", search_phrase)
         
-        # Handle data field if nested
-        data = content_data.get("data", content_data)
-        customization = content_data.get("customization")
+        # Handle data field if nested; otherwise the body itself is the data
+        if payload.data is not None:
+            data = payload.data
+        else:
+            data = payload.model_dump(exclude_unset=True)
+        customization = payload.customization
 
         # If data is a string, parse it as JSON
         if isinstance(data, str):
             try:
-                data = json.loads(data)
+                data = json_loads(data)
             except json.JSONDecodeError:
                 logger.error("Failed to parse 'data' string as JSON.")
-                return {"error": "Invalid format for 'data' field.", "status": "error"}
+                return error_response("Invalid format for 'data' field.", 400)
         
-        # Check if data has slides directly or if we need to convert from old format
-        if "slides" not in data:
-            logger.warning(f"No 'slides' key found in data. Available keys: {list(data.keys())}")
-            
-            # Try to convert old ESG format to general slides
-            if "executiveSummary" in data:
-                logger.info("Converting old ESG format to general slides")
-                slides = []
-                
-                # Executive Summary slide
-                exec_summary = data.get("executiveSummary", {})
-                if isinstance(exec_summary, dict):
-                    key_finding = exec_summary.get('keyFinding', 'Key business findings and insights')
-                else:
-                    key_finding = str(exec_summary) if exec_summary else 'Key business findings and insights'
-                
-                slides.append({
-                    "title": f"Executive Summary: {search_phrase}",
-                    "headline": "Key Business Overview",
-                    "content": f"• {key_finding}\n• Market opportunities and strategic implications\n• Risk assessment and mitigation strategies\n• Recommended next steps for implementation"
-                })
-                
-                # Impact Analysis slide
-                if "impactAnalysis" in data:
-                    impact = data["impactAnalysis"]
-                    if isinstance(impact, dict):
-                        financial = impact.get('financial', 'Positive ROI expected')
-                    else:
-                        financial = 'Positive ROI expected'
-                    
-                    slides.append({
-                        "title": "Impact Analysis",
-                        "headline": "Business Impact Assessment",
-                        "content": f"• Financial impact: {financial}\n• Operational efficiency improvements\n• Strategic positioning advantages\n• Long-term business sustainability"
-                    })
-                
-                # Regional/Market Data slide
-                if "regionalData" in data and data["regionalData"]:
-                    regional_data = data["regionalData"]
-                    if isinstance(regional_data, list) and regional_data:
-                        regional = regional_data[0] if isinstance(regional_data[0], dict) else {}
-                    elif isinstance(regional_data, dict):
-                        regional = regional_data
-                    else:
-                        regional = {}
-                    
-                    region = regional.get('region', 'Global market') if isinstance(regional, dict) else 'Global market'
-                    trend = regional.get('trend', 'Positive growth trajectory') if isinstance(regional, dict) else 'Positive growth trajectory'
-                    
-                    slides.append({
-                        "title": "Market Analysis",
-                        "headline": "Regional and Market Insights",
-                        "content": f"• Region: {region}\n• Growth trends: {trend}\n• Market drivers and opportunities\n• Competitive landscape assessment"
-                    })
-                
-                data = {"slides": slides}
-            else:
-                # Create a meaningful slide from available data
-                available_keys = [k for k in data.keys() if k not in ['search_phrase', 'number_of_slides', 'timestamp']]
-                content_points = []
-                
-                for key in available_keys[:4]:  # Take up to 4 keys
-                    value = data.get(key, "")
-                    if isinstance(value, (str, int, float)) and str(value).strip():
-                        content_points.append(f"• {key.replace('_', ' ').title()}: {str(value)[:100]}")
-                    elif isinstance(value, dict) and value:
-                        content_points.append(f"• {key.replace('_', ' ').title()}: Analysis available")
-                    elif isinstance(value, list) and value:
-                        content_points.append(f"• {key.replace('_', ' ').title()}: {len(value)} items identified")
-                
-                if not content_points:
-                    content_points = [
-                        f"• Comprehensive analysis of {search_phrase}",
-                        "• Strategic business opportunities identified",
-                        "• Risk assessment and mitigation strategies",
-                        "• Implementation roadmap and recommendations"
-                    ]
-                
-                data = {
-                    "slides": [
-                        {
-                            "title": f"Business Analysis: {search_phrase}",
-                            "headline": "Comprehensive Business Intelligence",
-                            "content": "\n".join(content_points)
-                        }
-                    ]
-                }
+        # Convert legacy payload shapes to {"slides": [...]}
+        data = normalize_slide_data(data, search_phrase)
         
         # Always create general slides presentation using rich visuals
         logger.info("Creating general slides presentation with charts and tables")
         
-        with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-            # Try to use the new rich presentation generator first
-            presentation = create_general_presentation(data, search_phrase, customization)
-            if presentation:
-                presentation.save(tmp.name)
-                
-                # --- VALIDATION STEP ---
-                with open(tmp.name, "rb") as f:
-                    file_content = f.read()
-                if not is_valid_pptx(file_content):
-                    logger.error("Validation failed: Generated a corrupted file locally.")
-                    return {
-                        "error": "The server generated a corrupted presentation file. Please check the logs.",
-                        "status": "error"
-                    }
-                # --- END VALIDATION ---
-                
-                success = True
-            else:
+        key = render_key(data, search_phrase, customization)
+        file_content = rendered_decks.get(key)
+        if file_content is not None:
+            logger.info("Serving cached presentation for an identical request")
+        else:
+            # Render in the process pool so the event loop keeps serving other requests;
+            # the deck comes back as bytes and is served without touching /tmp
+            file_content = await render_once(key, request.app.state, data, search_phrase, customization)
+            if not file_content:
                 logger.error("Failed to generate presentation with general_presentation")
-                return {"error": "Failed to create PowerPoint presentation", "status": "error"}
+                return error_response("Failed to create PowerPoint presentation", 500)
             
-            if not success:
-                return {"error": "Failed to create PowerPoint presentation", "status": "error"}
+            # --- VALIDATION STEP ---
+            if not is_valid_pptx(file_content):
+                logger.error("Validation failed: Generated a corrupted file locally.")
+                return error_response("The server generated a corrupted presentation file. Please check the logs.", 500)
+            # --- END VALIDATION ---
             
-            # Return file directly (hardcoded for n8n compatibility)
-            filename = f"{search_phrase.replace(' ', '_')}_Presentation.pptx"
-            logger.info(f"Returning presentation file directly: {filename}")
-            return FileResponse(
-                path=tmp.name,
-                filename=filename,
-                media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-            )
+            if len(file_content) <= RENDER_CACHE_BYTES:
+                rendered_decks[key] = file_content
+        
+        # Return file directly (hardcoded for n8n compatibility)
+        filename = f"{search_phrase.translate(SAFE_FILENAME)}_Presentation.pptx"
+        logger.info("Returning presentation file directly: %s", filename)
+        return Response(
+            content=file_content,
+            media_type=PPTX_MIME,
+            headers={"Content-Disposition": content_disposition(filename)}
+        )
             
     except Exception as e:
-        logger.error(f"Error creating presentation: {str(e)}")
-        return {"error": f"Failed to create presentation: {str(e)}", "status": "error"}
+        logger.error("Error creating presentation: %s", e)
+        return error_response(f"Failed to create presentation: {str(e)}", 500)
 
 @app.get("/health")
 async def health_check():
@@ -422,4 +758,4 @@ async def health_check():
     return {"status": "healthy", "service": "pptx-generator"}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8010)
+    uvicorn.run("main:app", host="0.0.0.0", port=8010, workers=WORKERS, loop="uvloop", http="httptools")
@@ -25,7 +25,8 @@ async function handleQuickGeneration(e) {
         title_bg_color: document.getElementById('titleBgColor').value,
         body_text_color: document.getElementById('bodyTextColor').value,
         title_position: document.getElementById('titlePosition').value,
-        font_size: parseInt(document.getElementById('fontSize').value)
+        font_size: parseInt(document.getElementById('fontSize').value),
+        native_charts: document.getElementById('nativeCharts').checked
     };
 
     // Prevent double submissions
@@ -69,7 +70,13 @@ async function handleQuickGeneration(e) {
         });
 
         if (!response.ok) {
-            throw new Error(`Server error: ${response.status}`);
+            // Error responses carry a JSON body with an "error" message
+            let errorMessage = `Server error: ${response.status}`;
+            if ((response.headers.get('content-type') || '').includes('application/json')) {
+                const errorData = await response.json();
+                errorMessage = errorData.error || errorData.message || errorMessage;
+            }
+            throw new Error(errorMessage);
         }
 
         // Handle response - either PowerPoint file or JSON error
@@ -0,0 +1,48 @@
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# main.py resolves templates/ and static/ relative to the working directory
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+os.chdir(SERVICE_DIR)
+sys.path.insert(0, str(SERVICE_DIR))
+
+import main  # noqa: E402
+from general_presentation import render_general_presentation  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One app lifespan (and render pool) for the whole session"""
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def pptx_bytes():
+    """A small, valid deck"""
+    return render_general_presentation({"slides": [{"title": "A", "content": "x"}]}, "t")
+
+
+@pytest.fixture
+def pptx_dir(tmp_path, monkeypatch):
+    """Point PPTX_DIR at a per-test directory"""
+    monkeypatch.setattr(main, "PPTX_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def n8n(client, monkeypatch):
+    """Replace the shared n8n client; set n8n.handler to an httpx MockTransport handler"""
+    class MockN8N:
+        handler = None
+
+    mock = MockN8N()
+    transport = httpx.MockTransport(lambda request: mock.handler(request))
+    monkeypatch.setattr(client.app.state, "http_client", httpx.AsyncClient(transport=transport))
+    main.recent_requests.clear()
+    return mock
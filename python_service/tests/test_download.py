@@ -0,0 +1,98 @@
+import main
+
+
+# --- /download conditional requests and streaming and byte ranges (chunk3-20, chunk3-22) ---
+
+def test_download_streams_file(client, pptx_dir):
+    content = bytes(range(256)) * 1200  # several STREAM_CHUNK_SIZE reads
+    (pptx_dir / "pptx_big.pptx").write_bytes(content)
+    response = client.get("/download/pptx_big.pptx")
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-length"] == str(len(content))
+    assert response.headers["content-type"] == main.PPTX_MIME
+    assert response.headers["content-disposition"] == 'attachment; filename="slides.pptx"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "last-modified" in response.headers
+
+
+def test_download_etag_revalidation(client, pptx_dir, pptx_bytes):
+    (pptx_dir / "pptx_deck.pptx").write_bytes(pptx_bytes)
+    etag = client.get("/download/pptx_deck.pptx").headers["etag"]
+    assert etag.startswith('W/"')
+
+    not_modified = client.get("/download/pptx_deck.pptx", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get("/download/pptx_deck.pptx", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert client.get("/download/pptx_deck.pptx", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_download_head(client, pptx_dir, pptx_bytes):
+    (pptx_dir / "pptx_deck.pptx").write_bytes(pptx_bytes)
+    response = client.head("/download/pptx_deck.pptx")
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == str(len(pptx_bytes))
+
+
+def test_download_missing_and_empty(client, pptx_dir):
+    assert client.get("/download/pptx_missing.pptx").status_code == 404
+    (pptx_dir / "pptx_empty.pptx").write_bytes(b"")
+    assert client.get("/download/pptx_empty.pptx").status_code == 500
+
+
+def test_download_not_gzipped(client, pptx_dir, pptx_bytes):
+    (pptx_dir / "pptx_deck.pptx").write_bytes(pptx_bytes)
+    response = client.get("/download/pptx_deck.pptx", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == pptx_bytes
+    assert client.get("/", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+
+
+
+def test_download_single_byte_range(client, pptx_dir):
+    content = bytes(range(256)) * 1200
+    (pptx_dir / "pptx_big.pptx").write_bytes(content)
+    size = len(content)
+
+    response = client.get("/download/pptx_big.pptx", headers={"Range": "bytes=100-70099"})
+    assert response.status_code == 206
+    assert response.content == content[100:70100]
+    assert response.headers["content-range"] == f"bytes 100-70099/{size}"
+    assert response.headers["content-length"] == "70000"
+
+    suffix = client.get("/download/pptx_big.pptx", headers={"Range": "bytes=-10"})
+    assert suffix.status_code == 206
+    assert suffix.content == content[-10:]
+    assert suffix.headers["content-range"] == f"bytes {size - 10}-{size - 1}/{size}"
+
+    open_ended = client.get("/download/pptx_big.pptx", headers={"Range": f"bytes={size - 5}-"})
+    assert open_ended.content == content[-5:]
+    past_end = client.get("/download/pptx_big.pptx", headers={"Range": f"bytes={size - 5}-{size * 2}"})
+    assert past_end.headers["content-range"] == f"bytes {size - 5}-{size - 1}/{size}"
+
+
+def test_download_unsatisfiable_range(client, pptx_dir, pptx_bytes):
+    (pptx_dir / "pptx_deck.pptx").write_bytes(pptx_bytes)
+    size = len(pptx_bytes)
+    for header in (f"bytes={size}-", "bytes=-0"):
+        response = client.get("/download/pptx_deck.pptx", headers={"Range": header})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{size}"
+
+
+def test_download_ignored_ranges_send_whole_file(client, pptx_dir, pptx_bytes):
+    (pptx_dir / "pptx_deck.pptx").write_bytes(pptx_bytes)
+    etag = client.get("/download/pptx_deck.pptx").headers["etag"]
+    for headers in ({"Range": "bytes=0-1,5-6"}, {"Range": "bytes=9-2"}, {"Range": "items=0-1"},
+                    {"Range": "bytes=0-1", "If-Range": '"stale"'}):
+        response = client.get("/download/pptx_deck.pptx", headers=headers)
+        assert response.status_code == 200, headers
+        assert response.content == pptx_bytes
+
+    matching = client.get("/download/pptx_deck.pptx", headers={"Range": "bytes=0-1", "If-Range": etag})
+    assert matching.status_code == 206
+    assert matching.content == pptx_bytes[:2]
@@ -0,0 +1,166 @@
+import io
+import queue
+import zipfile
+from collections import OrderedDict
+
+import pytest
+
+import general_presentation
+
+
+@pytest.mark.parametrize("value, expected", [(None, 60), ("90", 90), ("abc", 60), ("0", 60), ("-5", 60)])
+def test_chart_dpi_from_env(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("SLIDER_CHART_DPI", raising=False)
+    else:
+        monkeypatch.setenv("SLIDER_CHART_DPI", value)
+    assert general_presentation._chart_dpi_from_env() == expected
+
+
+# --- Chart render cache (chunk0-1) ---
+
+PIE = {"labels": ["Renewable Energy", "Nuclear Power"], "values": [40, 60]}
+
+
+@pytest.fixture
+def chart_cache(monkeypatch):
+    """An empty chart cache for the test"""
+    monkeypatch.setattr(general_presentation, "_CHART_CACHE", OrderedDict())
+    return general_presentation._CHART_CACHE
+
+
+def chart_key(chart_type, labels, values):
+    return general_presentation._chart_cache_key(chart_type, labels, values, general_presentation.CHART_DPI)
+
+
+def test_chart_cache_key_covers_type_labels_values_and_dpi():
+    key = chart_key("pie", ["a", "b"], [1, 2])
+    assert key == chart_key("pie", ["a", "b"], [1, 2])
+    assert key != chart_key("bar", ["a", "b"], [1, 2])
+    assert key != chart_key("pie", ["a", "c"], [1, 2])
+    assert key != chart_key("pie", ["a", "b"], [1, 3])
+    assert key != general_presentation._chart_cache_key("pie", ["a", "b"], [1, 2], 120)
+    # Numeric and string labels render differently, so they must not share a key
+    assert chart_key("bar", [1], [1]) != chart_key("bar", ["1"], [1])
+
+
+def test_identical_charts_rendered_once(chart_cache):
+    deck = general_presentation.GeneralPresentation({"slides": []})
+    first = deck._create_data_chart(PIE, "pie").getvalue()
+    assert len(chart_cache) == 1
+    assert deck._create_data_chart(dict(PIE), "pie").getvalue() == first
+    assert len(chart_cache) == 1
+
+    assert deck._create_data_chart(PIE, "bar").getvalue() != first
+    assert deck._create_data_chart({**PIE, "values": [50, 50]}, "pie").getvalue() != first
+    assert len(chart_cache) == 3
+
+
+def test_chart_cache_evicts_least_recently_used(chart_cache, monkeypatch):
+    monkeypatch.setattr(general_presentation, "CHART_CACHE_SIZE", 2)
+    general_presentation._store_cached_chart("a", b"A")
+    general_presentation._store_cached_chart("b", b"B")
+    assert general_presentation._get_cached_chart("a") == b"A"  # "b" is now least recent
+    general_presentation._store_cached_chart("c", b"C")
+    assert list(chart_cache) == ["a", "c"]
+    assert general_presentation._get_cached_chart("b") is None
+
+
+# --- Table rows built as raw XML (chunk0-8) ---
+
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+def cell_fill(cell):
+    fill = cell._tc.find(f"{A_NS}tcPr/{A_NS}solidFill/{A_NS}srgbClr")
+    return None if fill is None else fill.get("val")
+
+
+def cell_font(cell):
+    return cell._tc.find(f"{A_NS}txBody/{A_NS}p/{A_NS}pPr/{A_NS}defRPr")
+
+
+def build_table(table_data, customization=None):
+    deck = general_presentation.GeneralPresentation({"slides": []}, customization=customization)
+    slide = deck.prs.slides.add_slide(deck.prs.slide_layouts[6])
+    return deck._create_data_table(slide, table_data)
+
+
+def test_table_header_and_alternating_rows():
+    table = build_table({"headers": ["Region", "Share"], "rows": [["EU", 40], ["US", 35], ["APAC", 25]]},
+                        customization={"title_bg_color": "#123456", "body_text_color": "#EEEEEE"})
+    assert len(table.rows) == 4
+    assert len(table.columns) == 2
+
+    header = table.cell(0, 0)
+    assert header.text == "Region"
+    assert cell_fill(header) == "123456"
+    assert cell_font(header).get("b") == "1"
+    assert cell_font(header).find(f"{A_NS}solidFill/{A_NS}srgbClr").get("val") == "FFFFFF"
+
+    assert [cell_fill(table.cell(r, 0)) for r in (1, 2, 3)] == ["2A3950", None, "2A3950"]
+    body = cell_font(table.cell(1, 1))
+    assert body.get("b") is None
+    assert body.get("sz") == "1200"
+    assert body.find(f"{A_NS}solidFill/{A_NS}srgbClr").get("val") == "EEEEEE"
+    assert table.cell(1, 1).text == "40"
+    # Every row keeps the row height python-pptx laid out
+    assert len({tr.get("h") for tr in table._tbl.tr_lst}) == 1
+
+
+def test_table_short_long_and_extra_rows():
+    rows = [["only one"], ["a", "b", "dropped"]] + [[str(i), str(i)] for i in range(20)]
+    table = build_table({"headers": ["A", "B"], "rows": rows})
+    assert len(table.rows) == 1 + general_presentation.GeneralPresentation({"slides": []}).MAX_ROWS_PER_TABLE
+    assert [table.cell(1, 0).text, table.cell(1, 1).text] == ["only one", ""]
+    assert len(table._tbl.tr_lst[1].tc_lst) == 2
+    assert [table.cell(2, 0).text, table.cell(2, 1).text] == ["a", "b"]
+
+
+def test_table_cell_text_escaped_and_split_into_paragraphs():
+    table = build_table({"headers": ["<H&1>"], "rows": [["line 1\nline 2"], ["bad\x01char"]]})
+    assert table.cell(0, 0).text == "<H&1>"
+    cell = table.cell(1, 0)
+    assert [p.text for p in cell.text_frame.paragraphs] == ["line 1", "line 2"]
+    assert table.cell(2, 0).text == "badchar"
+
+
+# --- Pooled Presentation reset (chunk0-20) ---
+
+RICH_DECK = {"slides": [
+    {"title": "Image chart", "content": "c", "chartType": "pie", "chartData": PIE},
+    {"title": "Table", "content": "c", "tableData": {"headers": ["A"], "rows": [["1"]]}},
+]}
+PLAIN_DECK = {"slides": [{"title": "Plain", "content": "only text"}]}
+
+
+def package_parts(pptx_bytes):
+    with zipfile.ZipFile(io.BytesIO(pptx_bytes)) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+@pytest.fixture
+def empty_pool(monkeypatch):
+    """A fresh presentation pool, so the next release is the next acquire"""
+    monkeypatch.setattr(general_presentation, "_PRESENTATION_POOL", queue.Queue(maxsize=1))
+    return general_presentation._PRESENTATION_POOL
+
+
+def test_released_deck_is_reset_before_reuse(empty_pool):
+    fresh = package_parts(general_presentation.render_general_presentation(PLAIN_DECK, "plain"))
+
+    for native_charts in (False, True):
+        rich = general_presentation.render_general_presentation(
+            RICH_DECK, "rich", {"slide_bg_color": "#AA0000"}, native_charts)
+        rich_parts = package_parts(rich)
+        assert any(name.startswith(("ppt/media/", "ppt/charts/")) for name in rich_parts)
+        assert empty_pool.qsize() == 1
+
+        reused = package_parts(general_presentation.render_general_presentation(PLAIN_DECK, "plain"))
+        assert empty_pool.qsize() == 1
+        assert sorted(reused) == sorted(fresh)
+        assert not any(name.startswith(("ppt/media/", "ppt/charts/", "ppt/embeddings/")) for name in reused)
+        for name, content in reused.items():
+            if name != "docProps/core.xml":  # holds the save timestamp
+                assert content == fresh[name], name
+        assert b'val="AA0000"' not in reused["ppt/slideMasters/slideMaster1.xml"]
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+import main
+
+SLIDE_DATA = {"slides": [{"title": "T", "content": "c"}]}
+
+
+# --- /create-presentation result cache and render coalescing (chunk4-5) ---
+
+class CountingPool(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        CountingPool.submitted += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_identical_renders_coalesced_and_cached(client, monkeypatch, pptx_bytes):
+    def slow_render(*args):
+        time.sleep(0.2)
+        return pptx_bytes
+
+    pool = CountingPool(max_workers=4)
+    CountingPool.submitted = 0
+    monkeypatch.setattr(client.app.state, "render_pool", pool)
+    monkeypatch.setattr(main, "render_general_presentation", slow_render)
+    main.rendered_decks.clear()
+    body = {"search_phrase": "coalesce", "data": SLIDE_DATA}
+
+    async def post_concurrently():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*[http.post("/create-presentation", json=body) for _ in range(5)])
+
+    responses = asyncio.run(post_concurrently())
+    assert [r.status_code for r in responses] == [200] * 5
+    assert {r.content for r in responses} == {pptx_bytes}
+    assert CountingPool.submitted == 1
+    assert main.pending_renders == {}
+
+    assert client.post("/create-presentation", json=body).content == pptx_bytes
+    assert CountingPool.submitted == 1
+
+    client.post("/create-presentation", json={**body, "search_phrase": "other"})
+    assert CountingPool.submitted == 2
+    pool.shutdown()
+
+
+def test_render_key_accepts_wide_integers():
+    wide = {"slides": [{"chartData": {"values": [10 ** 30]}}]}
+    assert main.render_key(wide, "x", None) != main.render_key({"slides": []}, "x", None)
+
+
+def test_create_presentation_renders_in_pool(client):
+    main.rendered_decks.clear()
+    response = client.post("/create-presentation", json={"search_phrase": "Dé mo", "data": SLIDE_DATA})
+    assert response.status_code == 200
+    assert main.is_valid_pptx(response.content)
+    assert response.headers["content-disposition"] == "attachment; filename*=utf-8''D%C3%A9_mo_Presentation.pptx"
+
+
+def test_render_pool_replaced_after_a_render_process_dies(client):
+    pool = client.app.state.render_pool
+    pool.submit(int).result()
+    for process in list(pool._processes.values()):
+        process.kill()
+        process.join()
+    main.rendered_decks.clear()
+    body = {"search_phrase": "crash", "data": SLIDE_DATA}
+
+    assert client.post("/create-presentation", json=body).status_code == 500
+    assert client.app.state.render_pool is not pool
+    response = client.post("/create-presentation", json=body)
+    assert response.status_code == 200
+    assert main.is_valid_pptx(response.content)
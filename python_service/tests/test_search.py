@@ -0,0 +1,97 @@
+import httpx
+from cachetools import TTLCache
+
+import main
+
+
+# --- Dedup cooldown (chunk2-21) ---
+
+def test_duplicate_request_blocked_within_cooldown(client, n8n, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(main, "recent_requests", TTLCache(maxsize=10, ttl=main.REQUEST_COOLDOWN, timer=lambda: clock[0]))
+    monkeypatch.setattr(main.time, "monotonic", lambda: clock[0])
+    n8n.handler = lambda request: httpx.Response(200, json={"ok": 1})
+    body = {"search_phrase": "dup", "number_of_slides": 3}
+
+    assert client.post("/generate-slides-from-search", json=body).status_code == 200
+    clock[0] += 1
+    blocked = client.post("/generate-slides-from-search", json=body)
+    assert blocked.status_code == 429
+    assert blocked.json()["status"] == "rate_limited"
+
+    # Different slides count is a different request
+    assert client.post("/generate-slides-from-search", json={**body, "number_of_slides": 4}).status_code == 200
+
+    clock[0] += main.REQUEST_COOLDOWN
+    assert client.post("/generate-slides-from-search", json=body).status_code == 200
+
+
+class ExpiresBetweenReads(dict):
+    """A cache whose entry expires after the membership test but before the read"""
+    def __contains__(self, key):
+        return True
+
+    def __getitem__(self, key):
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return default
+
+
+def test_entry_expiring_mid_check_is_not_a_duplicate(client, n8n, monkeypatch):
+    monkeypatch.setattr(main, "recent_requests", ExpiresBetweenReads())
+    n8n.handler = lambda request: httpx.Response(200, json={"ok": 1})
+    response = client.post("/generate-slides-from-search", json={"search_phrase": "expiring", "number_of_slides": 3})
+    assert response.status_code == 200
+
+
+# --- n8n deck download to a tempfile ---
+
+def test_n8n_deck_returned_and_tempfile_removed(client, n8n, pptx_dir, pptx_bytes):
+    n8n.handler = lambda request: httpx.Response(
+        200, content=pptx_bytes, headers={"content-type": "Application/vnd.openxmlformats-officedocument.presentationml.presentation; charset=binary"})
+    response = client.post("/generate-slides-from-search", json={"search_phrase": "deck", "number_of_slides": 3})
+    assert response.status_code == 200
+    assert response.content == pptx_bytes
+    assert list(pptx_dir.iterdir()) == []
+
+
+def test_n8n_dropped_transfer_leaves_no_partial_file(client, n8n, pptx_dir):
+    class DroppedStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"PK\x03\x04" + b"x" * 100_000
+            raise httpx.ReadError("connection dropped")
+
+    n8n.handler = lambda request: httpx.Response(200, stream=DroppedStream(), headers={"content-type": main.PPTX_MIME})
+    response = client.post("/generate-slides-from-search", json={"search_phrase": "drop", "number_of_slides": 3})
+    assert response.status_code == 502
+    assert list(pptx_dir.iterdir()) == []
+
+
+# --- Integers wider than 64 bits (chunk2-11) ---
+
+WIDE = 100000000000000000000000
+
+
+def test_wide_integers_round_trip_exactly(client, n8n):
+    sent = []
+
+    def handler(request):
+        sent.append(request.content)
+        return httpx.Response(200, content=b'{"rows": %d}' % WIDE, headers={"content-type": "application/json"})
+
+    n8n.handler = handler
+    response = client.post("/generate-slides-from-search", json={"search_phrase": "wide", "number_of_slides": WIDE})
+    assert response.status_code == 200
+    assert main.json_loads(sent[0])["number_of_slides"] == WIDE
+    assert response.json()["webhook_response"] == {"rows": WIDE}
+    assert response.json()["number_of_slides"] == WIDE
+
+    assert client.post("/generate-slides-from-search", json={"search_phrase": "wide", "number_of_slides": WIDE}).status_code == 429
+
+
+def test_json_helpers_keep_wide_integers():
+    assert main.json_loads('{"a": %d}' % WIDE) == {"a": WIDE}
+    assert main.json_loads(b"[%d, 1.5]" % -WIDE) == [-WIDE, 1.5]
+    assert main.json_loads(b'{"b": 1, "a": 2}') == {"b": 1, "a": 2}
+    assert main.json_dumps({"b": WIDE, "a": 1}, sort_keys=True) == b'{"a":1,"b":%d}' % WIDE
@@ -0,0 +1,51 @@
+from main import normalize_slide_data
+
+ESG_PAYLOAD = {
+    "executiveSummary": {"keyFinding": "Emissions down 12%"},
+    "impactAnalysis": {"financial": "Savings of $2M"},
+    "regionalData": [{"region": "EU", "trend": "Rising"}],
+}
+
+
+def test_slides_payload_passed_through():
+    data = {"slides": [{"title": "T"}]}
+    assert normalize_slide_data(data, "x") is data
+
+
+def test_esg_payload_follows_spec_order():
+    slides = normalize_slide_data(ESG_PAYLOAD, "Energy")["slides"]
+    assert [s["title"] for s in slides] == ["Executive Summary: Energy", "Impact Analysis", "Market Analysis"]
+    assert "Emissions down 12%" in slides[0]["content"]
+    assert "Financial impact: Savings of $2M" in slides[1]["content"]
+    assert "Region: EU" in slides[2]["content"]
+    assert "Growth trends: Rising" in slides[2]["content"]
+
+
+def test_esg_payload_skips_missing_and_empty_fields():
+    payload = {"executiveSummary": "Plain text finding", "regionalData": []}
+    slides = normalize_slide_data(payload, "Energy")["slides"]
+    assert [s["title"] for s in slides] == ["Executive Summary: Energy"]
+    assert "Plain text finding" in slides[0]["content"]
+
+
+def test_esg_regional_data_as_dict():
+    payload = {"executiveSummary": {}, "regionalData": {"region": "APAC"}}
+    slides = normalize_slide_data(payload, "x")["slides"]
+    assert "Region: APAC" in slides[-1]["content"]
+
+
+def test_other_payload_summarised_in_one_slide():
+    payload = {"search_phrase": "x", "market_size": "Large", "risks": [1, 2], "details": {"a": 1}}
+    slides = normalize_slide_data(payload, "Widgets")["slides"]
+    assert len(slides) == 1
+    assert slides[0]["title"] == "Business Analysis: Widgets"
+    assert slides[0]["content"].split("\n") == [
+        "• Market Size: Large",
+        "• Risks: 2 items identified",
+        "• Details: Analysis available",
+    ]
+
+
+def test_empty_summary_falls_back_to_generic_points():
+    slides = normalize_slide_data({"timestamp": 1}, "Widgets")["slides"]
+    assert slides[0]["content"].startswith("• Comprehensive analysis of Widgets")